@@ -18,6 +18,7 @@ Examples:
     python batch-project-updater.py --operation remove-package-versions --directory ./src
     python batch-project-updater.py --operation add-generate-assembly-info --pattern "**/*.csproj"
     python batch-project-updater.py --operation remove-package --package-name "Microsoft.Bcl.Build"
+    python batch-project-updater.py --operation remove-package-versions --jobs 4
 """
 
 import os
@@ -25,182 +26,238 @@ import re
 import sys
 import argparse
 import glob
+import shutil
+import tempfile
+import functools
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
+# Pattern is compiled once at import time and reused for every project file
+PKG_VERSION_RE = re.compile(r'(<PackageReference\s+Include="[^"]+")(\s+Version="[^"]+")(\s*/?)')
+
+@functools.lru_cache(maxsize=128)
+def _pkg_remove_pattern(package_name):
+    """Compiled pattern matching a PackageReference for a specific package"""
+    return re.compile(rf'<PackageReference\s+Include="{re.escape(package_name)}"[^>]*/?>\s*\n?', re.MULTILINE)
+
+def _walk_csproj(root):
+    """Recursively yield .csproj paths under root using os.scandir"""
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _walk_csproj(entry.path)
+                elif entry.name.endswith('.csproj'):
+                    yield entry.path
+    except OSError:
+        # Unreadable, missing or not a directory: nothing to yield, as with rglob
+        return
+
+def _write_atomic(file_path, content):
+    """Replace file content via a temporary file so a crash never leaves it truncated"""
+    # A uniquely named temp file beside the project never clobbers an existing file
+    tmp = tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False,
+                                      dir=os.path.dirname(file_path) or '.',
+                                      prefix=f"{os.path.basename(file_path)}.",
+                                      suffix='.tmp')
+    tmp_path = tmp.name
+    try:
+        with tmp:
+            tmp.write(content)
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        # Don't leave the temp file behind in the user's tree
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+def _backup_file(file_path, original_bytes):
+    """Create backup of file before modification, returning the backup path if one was written"""
+    backup_path = f"{file_path}.backup"
+    if not os.path.exists(backup_path):
+        # Write the bytes already read for processing instead of re-reading the
+        # file; they are the original as-is, line endings included
+        Path(backup_path).write_bytes(original_bytes)
+        return backup_path
+    return None
+
+# Per-file operations. Each takes the project file content and returns
+# (modified_content or None, message, change summary or None).
+
+def _remove_package_versions(content):
+    """Remove Version attributes from PackageReference elements"""
+    # Cheap substring check before running the regex
+    if '<PackageReference' not in content or 'Version=' not in content:
+        return None, "No changes needed", None
+    
+    # Replace with PackageReference without Version, counting in the same pass
+    modified_content, changes = PKG_VERSION_RE.subn(r'\1\3', content)
+    
+    if changes:
+        return modified_content, f"Removed {changes} Version attributes", f"Removed {changes} Version attributes"
+    return None, "No changes needed", None
+
+def _add_generate_assembly_info(content):
+    """Add GenerateAssemblyInfo=false to a project that references SharedAssemblyInfo"""
+    # Check if project references SharedAssemblyInfo
+    if 'SharedAssemblyInfo' not in content:
+        return None, "No SharedAssemblyInfo reference found, skipping", None
+    
+    # Check if GenerateAssemblyInfo already exists
+    if 'GenerateAssemblyInfo' in content:
+        return None, "GenerateAssemblyInfo already present", None
+    
+    if '<PropertyGroup>' not in content:
+        return None, "No changes made", None
+    
+    # Find first PropertyGroup and add GenerateAssemblyInfo
+    modified_content = content.replace(
+        '<PropertyGroup>',
+        '<PropertyGroup>\n    <GenerateAssemblyInfo>false</GenerateAssemblyInfo>',
+        1
+    )
+    
+    return modified_content, "Added GenerateAssemblyInfo=false", "Added GenerateAssemblyInfo=false"
+
+def _remove_package_reference(content, package_name):
+    """Remove PackageReference entries for a specific package"""
+    if package_name not in content:
+        return None, "Package not found", None
+    
+    # Pattern to match PackageReference for specific package
+    modified_content = _pkg_remove_pattern(package_name).sub('', content)
+    
+    if modified_content != content:
+        return modified_content, f"Removed PackageReference for {package_name}", f"Removed {package_name}"
+    return None, "Package not found", None
+
+def _add_property(content, property_name, property_value):
+    """Add a property to the first PropertyGroup in a project"""
+    # Check if property already exists
+    if f'<{property_name}>' in content:
+        return None, f"{property_name} already present", None
+    
+    if '<PropertyGroup>' not in content:
+        return None, "No changes made", None
+    
+    # Find first PropertyGroup and add property
+    modified_content = content.replace(
+        '<PropertyGroup>',
+        f'<PropertyGroup>\n    <{property_name}>{property_value}</{property_name}>',
+        1
+    )
+    
+    return modified_content, f"Added {property_name}={property_value}", f"Added {property_name}={property_value}"
+
+def _process_project_file(project_file, operation, op_args, dry_run):
+    """Apply an operation to a single project file.
+    
+    Runs in a worker process, so output is collected and returned rather
+    than printed. Returns (output lines, change summary or None).
+    """
+    output = [f"\nProcessing: {project_file}"]
+    change = None
+    
+    try:
+        original_bytes = Path(project_file).read_bytes()
+        # Decode as read_text would, translating CRLF and CR to '\n'
+        content = original_bytes.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        
+        modified_content, message, summary = operation(content, *op_args)
+        
+        if modified_content is not None:
+            if not dry_run:
+                backup_path = _backup_file(project_file, original_bytes)
+                if backup_path:
+                    output.append(f"  Created backup: {backup_path}")
+                _write_atomic(project_file, modified_content)
+            change = f"{project_file}: {summary}"
+        
+        output.append(f"  {message}")
+        
+    except Exception as e:
+        output.append(f"  Error processing {project_file}: {e}")
+    
+    return output, change
+
 class BatchProjectUpdater:
-    def __init__(self, dry_run=False):
+    def __init__(self, dry_run=False, jobs=None):
         self.dry_run = dry_run
+        self.jobs = jobs or os.cpu_count() or 1
         self.changes_made = []
+        self.files_checked = 0
         
     def find_project_files(self, directory=None, pattern=None):
-        """Find all .csproj files in directory or matching pattern"""
+        """Lazily iterate over .csproj files in directory or matching pattern"""
         if pattern:
-            return glob.glob(pattern, recursive=True)
-        elif directory:
-            directory = Path(directory)
-            return list(directory.rglob("*.csproj"))
+            return glob.iglob(pattern, recursive=True)
+        return _walk_csproj(directory or ".")
+    
+    def prefilter(self, project_files, needle):
+        """Yield only the project files whose raw bytes contain needle"""
+        for project_file in project_files:
+            try:
+                with open(project_file, 'rb') as f:
+                    if needle not in f.read():
+                        # Skipped files were still checked
+                        self.files_checked += 1
+                        continue
+            except OSError:
+                # Let the operation itself report unreadable files
+                pass
+            yield project_file
+    
+    def _run(self, operation, project_files, *op_args):
+        """Apply operation to every project file, in parallel when jobs > 1"""
+        worker = functools.partial(_process_project_file, operation=operation,
+                                   op_args=op_args, dry_run=self.dry_run)
+        
+        if self.jobs > 1:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                results = executor.map(worker, project_files, chunksize=8)
+                self._collect(results)
         else:
-            return list(Path(".").rglob("*.csproj"))
+            self._collect(map(worker, project_files))
     
-    def backup_file(self, file_path):
-        """Create backup of file before modification"""
-        backup_path = f"{file_path}.backup"
-        if not os.path.exists(backup_path):
-            with open(file_path, 'r', encoding='utf-8') as original:
-                with open(backup_path, 'w', encoding='utf-8') as backup:
-                    backup.write(original.read())
-            print(f"  Created backup: {backup_path}")
+    def _collect(self, results):
+        """Print worker output in file order and record changes"""
+        for output, change in results:
+            self.files_checked += 1
+            print("\n".join(output))
+            if change:
+                self.changes_made.append(change)
     
     def remove_package_versions(self, project_files):
         """Remove Version attributes from PackageReference elements"""
         print("Removing Version attributes from PackageReference elements...")
-        
-        for project_file in project_files:
-            print(f"\nProcessing: {project_file}")
-            
-            try:
-                with open(project_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                original_content = content
-                
-                # Pattern to match PackageReference with Version attribute
-                pattern = r'(<PackageReference\s+Include="[^"]+")(\s+Version="[^"]+")(\s*/?)'
-                
-                # Replace with PackageReference without Version
-                modified_content = re.sub(pattern, r'\1\3', content)
-                
-                if modified_content != original_content:
-                    if not self.dry_run:
-                        self.backup_file(project_file)
-                        with open(project_file, 'w', encoding='utf-8') as f:
-                            f.write(modified_content)
-                    
-                    # Count changes
-                    changes = len(re.findall(pattern, content))
-                    print(f"  Removed {changes} Version attributes")
-                    self.changes_made.append(f"{project_file}: Removed {changes} Version attributes")
-                else:
-                    print("  No changes needed")
-                    
-            except Exception as e:
-                print(f"  Error processing {project_file}: {e}")
+        self._run(_remove_package_versions, project_files)
     
     def add_generate_assembly_info(self, project_files):
         """Add GenerateAssemblyInfo=false to projects that reference SharedAssemblyInfo"""
         print("Adding GenerateAssemblyInfo=false to projects with SharedAssemblyInfo...")
-        
-        for project_file in project_files:
-            print(f"\nProcessing: {project_file}")
-            
-            try:
-                with open(project_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Check if project references SharedAssemblyInfo
-                if 'SharedAssemblyInfo' not in content:
-                    print("  No SharedAssemblyInfo reference found, skipping")
-                    continue
-                
-                # Check if GenerateAssemblyInfo already exists
-                if 'GenerateAssemblyInfo' in content:
-                    print("  GenerateAssemblyInfo already present")
-                    continue
-                
-                # Find first PropertyGroup and add GenerateAssemblyInfo
-                pattern = r'(<PropertyGroup>)'
-                replacement = r'\1\n    <GenerateAssemblyInfo>false</GenerateAssemblyInfo>'
-                
-                modified_content = re.sub(pattern, replacement, content, count=1)
-                
-                if modified_content != content:
-                    if not self.dry_run:
-                        self.backup_file(project_file)
-                        with open(project_file, 'w', encoding='utf-8') as f:
-                            f.write(modified_content)
-                    
-                    print("  Added GenerateAssemblyInfo=false")
-                    self.changes_made.append(f"{project_file}: Added GenerateAssemblyInfo=false")
-                else:
-                    print("  No changes made")
-                    
-            except Exception as e:
-                print(f"  Error processing {project_file}: {e}")
+        self._run(_add_generate_assembly_info, project_files)
     
     def remove_package_reference(self, project_files, package_name):
         """Remove specific PackageReference entries"""
         print(f"Removing PackageReference for {package_name}...")
-        
-        for project_file in project_files:
-            print(f"\nProcessing: {project_file}")
-            
-            try:
-                with open(project_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                original_content = content
-                
-                # Pattern to match PackageReference for specific package
-                pattern = rf'<PackageReference\s+Include="{re.escape(package_name)}"[^>]*/?>\s*\n?'
-                
-                modified_content = re.sub(pattern, '', content, flags=re.MULTILINE)
-                
-                if modified_content != original_content:
-                    if not self.dry_run:
-                        self.backup_file(project_file)
-                        with open(project_file, 'w', encoding='utf-8') as f:
-                            f.write(modified_content)
-                    
-                    print(f"  Removed PackageReference for {package_name}")
-                    self.changes_made.append(f"{project_file}: Removed {package_name}")
-                else:
-                    print("  Package not found")
-                    
-            except Exception as e:
-                print(f"  Error processing {project_file}: {e}")
+        self._run(_remove_package_reference, project_files, package_name)
     
     def add_property(self, project_files, property_name, property_value):
         """Add a property to the first PropertyGroup in projects"""
         print(f"Adding {property_name}={property_value} to projects...")
-        
-        for project_file in project_files:
-            print(f"\nProcessing: {project_file}")
-            
-            try:
-                with open(project_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Check if property already exists
-                if f'<{property_name}>' in content:
-                    print(f"  {property_name} already present")
-                    continue
-                
-                # Find first PropertyGroup and add property
-                pattern = r'(<PropertyGroup>)'
-                replacement = rf'\1\n    <{property_name}>{property_value}</{property_name}>'
-                
-                modified_content = re.sub(pattern, replacement, content, count=1)
-                
-                if modified_content != content:
-                    if not self.dry_run:
-                        self.backup_file(project_file)
-                        with open(project_file, 'w', encoding='utf-8') as f:
-                            f.write(modified_content)
-                    
-                    print(f"  Added {property_name}={property_value}")
-                    self.changes_made.append(f"{project_file}: Added {property_name}={property_value}")
-                else:
-                    print("  No changes made")
-                    
-            except Exception as e:
-                print(f"  Error processing {project_file}: {e}")
+        self._run(_add_property, project_files, property_name, property_value)
     
     def generate_summary(self):
         """Generate summary of all changes made"""
         print("\n" + "="*60)
         print("BATCH PROJECT UPDATE SUMMARY")
         print("="*60)
+        print(f"Project files checked: {self.files_checked}")
         print(f"Total files processed: {len(self.changes_made)}")
         
         if self.dry_run:
@@ -226,6 +283,8 @@ def main():
     parser.add_argument('--property-name', help='Property name for add-property operation')
     parser.add_argument('--property-value', help='Property value for add-property operation')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be changed without making changes')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                       help='Number of worker processes (default: CPU count, 1 disables parallelism)')
     
     args = parser.parse_args()
     
@@ -238,16 +297,29 @@ def main():
         print("Error: --property-name and --property-value are required for add-property operation")
         sys.exit(1)
     
-    updater = BatchProjectUpdater(dry_run=args.dry_run)
+    updater = BatchProjectUpdater(dry_run=args.dry_run, jobs=args.jobs)
     
-    # Find project files
+    # Find project files; the walk is lazy and feeds the workers as it goes
     project_files = updater.find_project_files(args.directory, args.pattern)
     
-    if not project_files:
+    # Peek at the first file so an empty tree is reported before any work starts
+    try:
+        first_file = next(project_files)
+    except StopIteration:
         print("No .csproj files found")
         sys.exit(1)
+    project_files = itertools.chain([first_file], project_files)
     
-    print(f"Found {len(project_files)} .csproj files")
+    # Drop files that cannot need changes with a plain bytes search before
+    # handing the rest to the regex-based workers
+    needles = {
+        'remove-package-versions': b'Version="',
+        'add-generate-assembly-info': b'SharedAssemblyInfo',
+        'remove-package': args.package_name.encode('utf-8') if args.package_name else None,
+    }
+    needle = needles.get(args.operation)
+    if needle:
+        project_files = updater.prefilter(project_files, needle)
     
     if args.dry_run:
         print("DRY RUN MODE - No changes will be made")
@@ -19,10 +19,47 @@ Features:
 import re
 import sys
 import os
+import io
 import json
+import functools
+import mmap
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import hyperscan
+except ImportError:
+    # Optional: Hyperscan finds the error codes in one vectorized pass so
+    # the combined regex only runs where they occur; without it the regex
+    # scans the whole log
+    hyperscan = None
+
+# Size of the slices fed to a Hyperscan stream
+HYPERSCAN_CHUNK_SIZE = 1 << 20
+
+@functools.lru_cache(maxsize=None)
+def _hyperscan_code_database(codes):
+    """Compile the error codes into a Hyperscan stream database, once per process.
+    
+    Returns (database, code lengths by pattern id), or None if compiling fails.
+    Only the literal codes go to Hyperscan: every error pattern starts with its
+    code, so the code positions are exactly where a match can start and the
+    regex then runs only there.
+    """
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_STREAM)
+    try:
+        database.compile(
+            expressions=[code.encode('ascii') for code in codes],
+            ids=list(range(len(codes))),
+            elements=len(codes),
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(codes)
+        )
+    except hyperscan.error as e:
+        print(f"Hyperscan unavailable, using regex scan: {e}", file=sys.stderr)
+        return None
+    return database, [len(code) for code in codes]
+
 class BuildLogAnalyzer:
     def __init__(self):
         self.error_patterns = {
@@ -54,44 +91,117 @@ class BuildLogAnalyzer:
             'NU1506': 3,  # Warning
             'NU1008': 3   # Warning
         }
+        
+        # Combine all patterns into one alternation so each log is scanned once.
+        # Each error code gets a named outer group; its own capture groups follow
+        # it, so record where they sit to slice out the details of a match.
+        # The pattern is compiled as bytes so it can run directly over an mmap.
+        alternatives = []
+        self.detail_groups = {}
+        group_index = 0
+        for error_code, pattern in self.error_patterns.items():
+            alternatives.append(f'(?P<{error_code}>{pattern})')
+            detail_count = re.compile(pattern).groups
+            self.detail_groups[error_code] = (group_index + 2, group_index + 2 + detail_count)
+            group_index += 1 + detail_count
+        self.combined_pattern = re.compile('|'.join(alternatives).encode('ascii'),
+                                           re.IGNORECASE | re.MULTILINE)
+        
+        # Each code split into its letters and digits, e.g. (b'NU', b'1103')
+        self.code_parts = []
+        for error_code in self.error_patterns:
+            letters, digits = re.fullmatch(r'([A-Z]+)(\d+)', error_code).groups()
+            self.code_parts.append((letters.encode('ascii'), digits.encode('ascii')))
+    
+    def _code_starts(self, data):
+        """Return the offsets in data where an error code starts, in any case"""
+        compiled = _hyperscan_code_database(tuple(self.error_patterns)) if hyperscan else None
+        starts = []
+        
+        if compiled is not None:
+            # Hyperscan reports where each code token ends
+            database, code_lengths = compiled
+            
+            def on_match(pattern_id, start, end, flags, context):
+                starts.append(end - code_lengths[pattern_id])
+            
+            with database.stream(match_event_handler=on_match) as stream:
+                for offset in range(0, len(data), HYPERSCAN_CHUNK_SIZE):
+                    stream.scan(data[offset:offset + HYPERSCAN_CHUNK_SIZE])
+            return starts
+        
+        # The digits of a code are the same in any case, so a plain find
+        # locates them and only the letters before each hit need checking
+        find = data.find
+        for letters, digits in self.code_parts:
+            position = find(digits, len(letters))
+            while position != -1:
+                start = position - len(letters)
+                if data[start:position].upper() == letters:
+                    starts.append(start)
+                position = find(digits, position + 1)
+        return starts
+    
+    def _find_matches(self, data):
+        """Yield combined-pattern matches in data, like combined_pattern.finditer"""
+        # Every pattern starts with its code, so a match can only start where
+        # a code does; run the regex just there, skipping candidates inside a
+        # previous match as finditer would
+        match_at = self.combined_pattern.match
+        position = 0
+        for start in sorted(self._code_starts(data)):
+            if start < position:
+                continue
+            m = match_at(data, start)
+            if m:
+                yield m
+                position = m.end()
 
     def analyze_log(self, log_path):
         """Analyze a single build log file"""
-        try:
-            with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-        except Exception as e:
-            print(f"Error reading {log_path}: {e}")
-            return None
-            
         results = {
             'file': log_path,
-            'errors': defaultdict(list),
+            # Parallel lists indexed by match; description and priority are
+            # derived from the error code when the results are exported
+            'error_codes': [],
+            'error_details': [],
             'summary': defaultdict(int),
-            'packages_affected': set(),
+            'packages': Counter(),  # package name -> number of matches
             'total_errors': 0
         }
         
-        for error_code, pattern in self.error_patterns.items():
-            matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE)
-            
-            for match in matches:
-                error_info = {
-                    'code': error_code,
-                    'description': self.error_descriptions[error_code],
-                    'priority': self.error_priorities[error_code],
-                    'details': match
-                }
-                
-                results['errors'][error_code].append(error_info)
-                results['summary'][error_code] += 1
-                results['total_errors'] += 1
-                
-                # Extract package name (usually first capture group)
-                if match and isinstance(match, tuple) and len(match) > 0:
-                    results['packages_affected'].add(match[0])
-        
-        results['packages_affected'] = list(results['packages_affected'])
+        # Bind lookups used on every match to locals
+        detail_groups = self.detail_groups
+        error_codes = results['error_codes']
+        error_details = results['error_details']
+        summary = results['summary']
+        packages = results['packages']
+        
+        try:
+            # Map the log instead of reading it so the regex scans the page
+            # cache directly; only matched groups are decoded. mmap cannot
+            # map an empty file, which has nothing to report anyway.
+            if os.path.getsize(log_path) > 0:
+                with open(log_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for m in self._find_matches(mm):
+                        error_code = m.lastgroup
+                        first, last = detail_groups[error_code]
+                        details = tuple(m.group(i).decode('utf-8', 'ignore') for i in range(first, last))
+                        # Like re.findall, a single capture group yields a plain string
+                        match = details if len(details) > 1 else details[0]
+                        
+                        error_codes.append(error_code)
+                        error_details.append(match)
+                        summary[error_code] += 1
+                        
+                        # Extract package name (usually first capture group)
+                        if match and isinstance(match, tuple) and len(match) > 0:
+                            packages[match[0]] += 1
+        except Exception as e:
+            print(f"Error reading {log_path}: {e}")
+            return None
+        
+        results['total_errors'] = len(error_codes)
         return results
 
     def analyze_directory(self, directory_path):
@@ -103,14 +213,14 @@ class BuildLogAnalyzer:
             print(f"No log files found in {directory_path}")
             return []
         
-        results = []
         for log_file in log_files:
             print(f"Analyzing {log_file.name}...")
-            result = self.analyze_log(log_file)
-            if result:
-                results.append(result)
         
-        return results
+        # Logs are independent, so scan them in parallel worker processes
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(self.analyze_log, log_files, chunksize=4))
+        
+        return [result for result in results if result]
 
     def generate_summary_report(self, results):
         """Generate a summary report from analysis results"""
@@ -125,69 +235,88 @@ class BuildLogAnalyzer:
         for result in results:
             for error_code, count in result['summary'].items():
                 error_counts[error_code] += count
-            for package in result['packages_affected']:
-                package_issues[package] += 1
+            package_issues += result['packages']
         
         # Generate report
-        report = []
-        report.append("=" * 60)
-        report.append("CENTRAL PACKAGE MANAGEMENT MIGRATION - BUILD LOG ANALYSIS")
-        report.append("=" * 60)
-        report.append(f"Total files analyzed: {len(results)}")
-        report.append(f"Total errors found: {total_errors}")
-        report.append("")
+        buf = io.StringIO()
+        write = buf.write
+        write("=" * 60 + "\n")
+        write("CENTRAL PACKAGE MANAGEMENT MIGRATION - BUILD LOG ANALYSIS\n")
+        write("=" * 60 + "\n")
+        write(f"Total files analyzed: {len(results)}\n")
+        write(f"Total errors found: {total_errors}\n")
+        write("\n")
         
         # Error summary by priority
-        report.append("ERROR SUMMARY BY PRIORITY:")
-        report.append("-" * 30)
+        write("ERROR SUMMARY BY PRIORITY:\n")
+        write("-" * 30 + "\n")
+        
+        priorities = self.error_priorities
+        descriptions = self.error_descriptions
         
         priority_groups = defaultdict(list)
         for error_code, count in error_counts.items():
-            priority = self.error_priorities[error_code]
+            priority = priorities[error_code]
             priority_groups[priority].append((error_code, count))
         
         priority_names = {1: "BLOCKING ERRORS", 2: "BUILD ISSUES", 3: "WARNINGS"}
         
         for priority in sorted(priority_groups.keys()):
-            report.append(f"\n{priority_names[priority]}:")
+            write(f"\n{priority_names[priority]}:\n")
             for error_code, count in sorted(priority_groups[priority], key=lambda x: x[1], reverse=True):
-                description = self.error_descriptions[error_code]
-                report.append(f"  {error_code}: {count:3d} - {description}")
+                description = descriptions[error_code]
+                write(f"  {error_code}: {count:3d} - {description}\n")
         
         # Most problematic packages
         if package_issues:
-            report.append("\nMOST PROBLEMATIC PACKAGES:")
-            report.append("-" * 30)
+            write("\nMOST PROBLEMATIC PACKAGES:\n")
+            write("-" * 30 + "\n")
             for package, count in package_issues.most_common(10):
-                report.append(f"  {package}: {count} issues")
+                write(f"  {package}: {count} issues\n")
         
         # Recommendations
-        report.append("\nRECOMMENDATIONS:")
-        report.append("-" * 15)
+        write("\nRECOMMENDATIONS:\n")
+        write("-" * 15 + "\n")
         
         if error_counts.get('NU1103', 0) > 0:
-            report.append("• NU1103 errors: Consider direct assembly references for problematic packages")
+            write("• NU1103 errors: Consider direct assembly references for problematic packages\n")
         if error_counts.get('NU1605', 0) > 0:
-            report.append("• NU1605 errors: Update package versions to resolve conflicts")
+            write("• NU1605 errors: Update package versions to resolve conflicts\n")
         if error_counts.get('NU1202', 0) > 0:
-            report.append("• NU1202 errors: Use framework-compatible package versions")
+            write("• NU1202 errors: Use framework-compatible package versions\n")
         if error_counts.get('NU1010', 0) > 0:
-            report.append("• NU1010 errors: Add missing PackageVersion entries to Directory.Packages.props")
+            write("• NU1010 errors: Add missing PackageVersion entries to Directory.Packages.props\n")
         if error_counts.get('MSB4062', 0) > 0:
-            report.append("• MSB4062 errors: Add <GenerateAssemblyInfo>false</GenerateAssemblyInfo> to projects")
+            write("• MSB4062 errors: Add <GenerateAssemblyInfo>false</GenerateAssemblyInfo> to projects\n")
         if error_counts.get('NU1506', 0) > 0:
-            report.append("• NU1506 warnings: Remove duplicate PackageVersion entries")
+            write("• NU1506 warnings: Remove duplicate PackageVersion entries\n")
         
-        return "\n".join(report)
+        return buf.getvalue()
 
     def export_detailed_results(self, results, output_path):
         """Export detailed results to JSON for further analysis"""
-        # Convert sets to lists for JSON serialization
+        # Expand the per-match lists into per-code error entries
+        descriptions = self.error_descriptions
+        priorities = self.error_priorities
+        
         serializable_results = []
         for result in results if isinstance(results, list) else [results]:
-            serializable_result = dict(result)
-            serializable_result['packages_affected'] = list(result['packages_affected'])
-            serializable_results.append(serializable_result)
+            errors = defaultdict(list)
+            for error_code, details in zip(result['error_codes'], result['error_details']):
+                errors[error_code].append({
+                    'code': error_code,
+                    'description': descriptions[error_code],
+                    'priority': priorities[error_code],
+                    'details': details
+                })
+            
+            serializable_results.append({
+                'file': result['file'],
+                'errors': errors,
+                'summary': result['summary'],
+                'packages': result['packages'],
+                'total_errors': result['total_errors']
+            })
         
         with open(output_path, 'w') as f:
             json.dump(serializable_results, f, indent=2, default=str)
@@ -217,7 +346,7 @@ def main():
     
     # Generate and display summary report
     summary = analyzer.generate_summary_report(results)
-    print(summary)
+    print(summary, end="")
     
     # Export detailed results
     output_file = "build-analysis-results.json"
@@ -17,13 +17,35 @@ Validation Checks:
 """
 
 import os
-import re
 import sys
 import argparse
-import xml.etree.ElementTree as ET
+import io
 from pathlib import Path
-from collections import defaultdict, Counter
-import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+from msbuild_xml import iter_elements, local_name, read_attribute_pairs
+
+def _scan_project_file(project_file):
+    """Collect PackageReference entries from a project file in a worker process.
+    
+    Returns (references with a Version as (include, version) pairs,
+    includes without a Version, error message or None).
+    """
+    package_refs_with_version = []
+    package_refs_without_version = []
+    
+    try:
+        for include, version in read_attribute_pairs(project_file, 'PackageReference',
+                                                      'Include', 'Version'):
+            if include:
+                if version:
+                    package_refs_with_version.append((include, version))
+                else:
+                    package_refs_without_version.append(include)
+    except Exception as e:
+        return [], [], str(e)
+    
+    return package_refs_with_version, package_refs_without_version, None
 
 class MigrationValidator:
     def __init__(self):
@@ -38,6 +60,7 @@ class MigrationValidator:
         self.packages_in_props = set()
         self.packages_in_projects = set()
         self.project_files = []
+        self._projects_with_packages_config = set()
         
     def validate_directory_packages_props(self, solution_dir="."):
         """Validate Directory.Packages.props file"""
@@ -51,42 +74,40 @@ class MigrationValidator:
             return False
         
         try:
-            tree = ET.parse(props_file)
-            root = tree.getroot()
-            
             details = []
             
-            # Check for ManagePackageVersionsCentrally property
             manage_centrally = False
-            for prop_group in root.findall('.//PropertyGroup'):
-                for prop in prop_group:
-                    if prop.tag == 'ManagePackageVersionsCentrally' and prop.text == 'true':
+            # Only names are needed, so entries go straight into packages_in_props
+            seen = self.packages_in_props
+            known_before = len(seen)
+            duplicates = []
+            
+            # Single streaming pass for the ManagePackageVersionsCentrally
+            # property and the PackageVersion entries
+            for elem in iter_elements(str(props_file), 'ManagePackageVersionsCentrally', 'PackageVersion'):
+                if local_name(elem.tag) == 'ManagePackageVersionsCentrally':
+                    if elem.text == 'true':
                         manage_centrally = True
-                        break
+                    continue
+                
+                include = elem.get('Include')
+                version = elem.get('Version')
+                
+                if include and version:
+                    # Interned so set operations against project names compare by identity
+                    include = sys.intern(include)
+                    if include in seen:
+                        duplicates.append(include)
+                    else:
+                        seen.add(include)
             
             if not manage_centrally:
                 details.append('ManagePackageVersionsCentrally property not set to true')
             
-            # Extract PackageVersion entries
-            package_versions = {}
-            duplicates = []
-            
-            for item_group in root.findall('.//ItemGroup'):
-                for package_version in item_group.findall('PackageVersion'):
-                    include = package_version.get('Include')
-                    version = package_version.get('Version')
-                    
-                    if include and version:
-                        if include in package_versions:
-                            duplicates.append(include)
-                        else:
-                            package_versions[include] = version
-                            self.packages_in_props.add(include)
-            
             if duplicates:
                 details.append(f'Duplicate PackageVersion entries: {", ".join(duplicates)}')
             
-            details.append(f'Found {len(package_versions)} PackageVersion entries')
+            details.append(f'Found {len(seen) - known_before} PackageVersion entries')
             
             if duplicates or not manage_centrally:
                 status = 'WARN' if not duplicates else 'FAIL'
@@ -109,42 +130,41 @@ class MigrationValidator:
     
     def validate_project_files(self, solution_dir="."):
         """Validate .csproj files for CPM compliance"""
-        solution_path = Path(solution_dir)
-        self.project_files = list(solution_path.rglob("*.csproj"))
+        # One walk collects project files and notes which ones still have a
+        # packages.config beside them, so no per-project stat() is needed
+        self.project_files = []
+        for dirpath, dirnames, filenames in os.walk(solution_dir):
+            has_packages_config = 'packages.config' in filenames
+            for filename in filenames:
+                if filename.endswith('.csproj'):
+                    project_file = os.path.join(dirpath, filename)
+                    self.project_files.append(project_file)
+                    if has_packages_config:
+                        self._projects_with_packages_config.add(project_file)
         
         details = []
         issues = []
         
-        for project_file in self.project_files:
-            try:
-                tree = ET.parse(project_file)
-                root = tree.getroot()
+        # Parse project files in worker processes; results come back in order
+        with ProcessPoolExecutor() as executor:
+            scans = executor.map(_scan_project_file, self.project_files, chunksize=16)
+            
+            for project_file, (package_refs_with_version, package_refs_without_version, error) in zip(self.project_files, scans):
+                project_name = os.path.basename(project_file)
                 
-                # Check for PackageReference elements with Version attributes
-                package_refs_with_version = []
-                package_refs_without_version = []
+                if error:
+                    issues.append(f'{project_name}: Error parsing - {error}')
+                    continue
                 
-                for package_ref in root.findall('.//PackageReference'):
-                    include = package_ref.get('Include')
-                    version = package_ref.get('Version')
-                    
-                    if include:
-                        if version:
-                            package_refs_with_version.append((include, version))
-                        else:
-                            package_refs_without_version.append(include)
-                            self.packages_in_projects.add(include)
+                # Check for PackageReference elements with Version attributes
+                self.packages_in_projects.update(map(sys.intern, package_refs_without_version))
                 
                 if package_refs_with_version:
-                    issues.append(f'{project_file.name}: {len(package_refs_with_version)} PackageReference elements still have Version attributes')
+                    issues.append(f'{project_name}: {len(package_refs_with_version)} PackageReference elements still have Version attributes')
                 
                 # Check for packages.config (should be removed)
-                packages_config = project_file.parent / "packages.config"
-                if packages_config.exists():
-                    issues.append(f'{project_file.name}: packages.config still exists')
-                
-            except Exception as e:
-                issues.append(f'{project_file.name}: Error parsing - {e}')
+                if project_file in self._projects_with_packages_config:
+                    issues.append(f'{project_name}: packages.config still exists')
         
         details.append(f'Validated {len(self.project_files)} project files')
         
@@ -205,37 +225,49 @@ class MigrationValidator:
             }
             return True
         
+        # Only needed when a build actually runs
+        import subprocess
+        
+        # Skip the telemetry notice and first-run setup each dotnet launch
+        # would otherwise do; anything set in the environment still wins
+        env = {
+            'DOTNET_CLI_TELEMETRY_OPTOUT': '1',
+            'DOTNET_NOLOGO': '1',
+            'DOTNET_SKIP_FIRST_TIME_EXPERIENCE': '1',
+            **os.environ
+        }
+        # At quiet verbosity MSBuild prints only errors, and it prints them to
+        # stdout, so that is all that gets buffered
+        run_options = dict(cwd=solution_dir, env=env, stdout=subprocess.PIPE,
+                           stderr=subprocess.STDOUT, text=True)
+        
         try:
             # Try dotnet restore
             restore_result = subprocess.run(
-                ['dotnet', 'restore'],
-                cwd=solution_dir,
-                capture_output=True,
-                text=True,
-                timeout=300
+                ['dotnet', 'restore', '--verbosity', 'quiet'],
+                timeout=300,
+                **run_options
             )
             
             details = []
             
             if restore_result.returncode != 0:
                 details.append('dotnet restore failed')
-                details.append(f'Error: {restore_result.stderr}')
+                details.append(f'Error: {restore_result.stdout}')
                 status = 'FAIL'
             else:
                 details.append('dotnet restore succeeded')
                 
                 # Try dotnet build
                 build_result = subprocess.run(
-                    ['dotnet', 'build', '--no-restore'],
-                    cwd=solution_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=600
+                    ['dotnet', 'build', '--no-restore', '--nologo', '--verbosity', 'quiet'],
+                    timeout=600,
+                    **run_options
                 )
                 
                 if build_result.returncode != 0:
                     details.append('dotnet build failed')
-                    details.append(f'Error: {build_result.stderr}')
+                    details.append(f'Error: {build_result.stdout}')
                     status = 'FAIL'
                 else:
                     details.append('dotnet build succeeded')
@@ -260,6 +292,14 @@ class MigrationValidator:
                 'details': [f'Build validation error: {e}']
             }
             return False
+        finally:
+            # Stop the MSBuild and compiler servers the build left running
+            try:
+                subprocess.run(['dotnet', 'build-server', 'shutdown'], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               timeout=60)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
     
     def calculate_overall_score(self):
         """Calculate overall migration score"""
@@ -298,18 +338,25 @@ class MigrationValidator:
             'score': round(overall_score, 1)
         }
     
-    def generate_report(self):
-        """Generate validation report"""
+    def generate_report(self, out=None):
+        """Generate validation report.
+        
+        With out the report is written line by line to that text stream and
+        None is returned; otherwise it is returned as a string.
+        """
         self.calculate_overall_score()
         
-        report = []
-        report.append("=" * 60)
-        report.append("CENTRAL PACKAGE MANAGEMENT MIGRATION VALIDATION REPORT")
-        report.append("=" * 60)
+        buf = None
+        if out is None:
+            out = buf = io.StringIO()
+        
+        print("=" * 60, file=out)
+        print("CENTRAL PACKAGE MANAGEMENT MIGRATION VALIDATION REPORT", file=out)
+        print("=" * 60, file=out)
         
         overall = self.validation_results['overall']
-        report.append(f"Overall Status: {overall['status']} ({overall['score']}%)")
-        report.append("")
+        print(f"Overall Status: {overall['status']} ({overall['score']}%)", file=out)
+        print(file=out)
         
         # Status indicators
         status_indicators = {
@@ -331,43 +378,39 @@ class MigrationValidator:
             if category_key in self.validation_results:
                 result = self.validation_results[category_key]
                 status_text = status_indicators.get(result['status'], result['status'])
-                report.append(f"{category_name}: {status_text}")
+                print(f"{category_name}: {status_text}", file=out)
                 
                 for detail in result['details']:
-                    report.append(f"  {detail}")
-                report.append("")
+                    print(f"  {detail}", file=out)
+                print(file=out)
         
         # Recommendations
-        report.append("RECOMMENDATIONS:")
-        report.append("-" * 15)
-        
-        recommendations = []
+        print("RECOMMENDATIONS:", file=out)
+        print("-" * 15, file=out)
         
         if self.validation_results['directory_packages_props']['status'] == 'FAIL':
-            recommendations.append("• Fix Directory.Packages.props issues before proceeding")
+            print("• Fix Directory.Packages.props issues before proceeding", file=out)
         
         if self.validation_results['project_files']['status'] == 'FAIL':
-            recommendations.append("• Remove Version attributes from PackageReference elements")
-            recommendations.append("• Delete remaining packages.config files")
+            print("• Remove Version attributes from PackageReference elements", file=out)
+            print("• Delete remaining packages.config files", file=out)
         
         if self.validation_results['package_consistency']['status'] == 'FAIL':
-            recommendations.append("• Add missing PackageVersion entries to Directory.Packages.props")
+            print("• Add missing PackageVersion entries to Directory.Packages.props", file=out)
         
         if self.validation_results['build_validation']['status'] == 'FAIL':
-            recommendations.append("• Resolve build errors before completing migration")
+            print("• Resolve build errors before completing migration", file=out)
         
         if overall['score'] >= 90:
-            recommendations.append("• Migration is complete and successful!")
-            recommendations.append("• Consider cleanup of unused PackageVersion entries")
+            print("• Migration is complete and successful!", file=out)
+            print("• Consider cleanup of unused PackageVersion entries", file=out)
         elif overall['score'] >= 75:
-            recommendations.append("• Migration is mostly complete - address remaining warnings")
+            print("• Migration is mostly complete - address remaining warnings", file=out)
         else:
-            recommendations.append("• Migration requires additional work - focus on failed validations")
+            print("• Migration requires additional work - focus on failed validations", file=out)
         
-        for rec in recommendations:
-            report.append(rec)
-        
-        return "\n".join(report)
+        if buf is not None:
+            return buf.getvalue()
 
 def main():
     parser = argparse.ArgumentParser(description='Validate CPM migration completeness')
@@ -397,14 +440,13 @@ def main():
     validator.validate_build(args.directory, args.skip_build)
     
     # Generate report
-    report = validator.generate_report()
-    
     if args.output:
         with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(report)
+            validator.generate_report(f)
         print(f"\nValidation report written to {args.output}")
     
-    print("\n" + report)
+    print()
+    validator.generate_report(sys.stdout)
     
     # Exit with appropriate code
     overall_status = validator.validation_results['overall']['status']
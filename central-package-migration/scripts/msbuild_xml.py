@@ -0,0 +1,105 @@
+"""
+MSBuild XML helpers shared by the CPM migration scripts
+
+Used by migration-validator.py and package-version-extractor.py, which import
+it from this directory. Elements are matched by local name, so projects in
+the MSBuild 2003 namespace are read the same as SDK-style projects.
+"""
+
+import re
+import functools
+import xml.parsers.expat
+
+try:
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
+
+def local_name(tag):
+    """Strip the namespace from an element tag, e.g. the MSBuild 2003 schema"""
+    return tag.rpartition('}')[2]
+
+def iter_elements(path, *tags):
+    """Stream the elements named in tags from an XML file without keeping the tree.
+    
+    Tags match by local name, so projects in the MSBuild 2003 namespace are
+    found as well. Each element is cleared once the caller moves on, so read
+    what is needed from it before advancing the iterator.
+    """
+    if HAVE_LXML:
+        # {*} matches the name in any namespace or none
+        wildcard_tags = tuple('{*}' + tag for tag in tags)
+        for _, elem in ET.iterparse(path, events=('end',), tag=wildcard_tags,
+                                    remove_comments=True, huge_tree=True):
+            yield elem
+            elem.clear()
+            # Drop already-processed siblings so the partial tree stays small
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    else:
+        # ElementTree has no tag filter or getprevious(), so hold on to the
+        # root and empty it after each hit; nothing parsed so far is needed again
+        context = ET.iterparse(path, events=('start', 'end'))
+        _, root = next(context)
+        for event, elem in context:
+            if event == 'end' and local_name(elem.tag) in tags:
+                yield elem
+                elem.clear()
+                root.clear()
+
+# Attribute scan over the raw bytes. Project files are small, so building
+# elements costs more than one regex pass; anything the regex cannot read the
+# way an XML parser would goes through iter_elements instead
+_SLOW_PATH_MARKERS = (b'<![CDATA[', b'<!DOCTYPE', b'xmlns:')
+_UTF16_BOMS = (b'\xff\xfe', b'\xfe\xff')
+_COMMENT_RE = re.compile(rb'<!--.*?-->', re.S)
+
+def _attribute_lookahead(name):
+    """Regex fragment capturing an attribute of the current start tag, in either quote style"""
+    # Skips whole quoted values, which may contain '>', e.g. in a Condition
+    return (rb'(?=(?:[^>"\']|"[^"]*"|\'[^\']*\')*?\s' + name.encode() +
+            rb'\s*=\s*(?:"([^"]*)"|\'([^\']*)\'))?')
+
+@functools.lru_cache(maxsize=8)
+def _attribute_pair_re(tag, key, value):
+    """Compile a regex capturing the key and value attributes of each tag element"""
+    return re.compile(rb'<' + tag.encode() + rb'(?=[\s/>])' +
+                      _attribute_lookahead(key) + _attribute_lookahead(value))
+
+def _is_well_formed(data):
+    """Check data with expat alone, which reports errors without building elements"""
+    try:
+        xml.parsers.expat.ParserCreate().Parse(data, True)
+    except xml.parsers.expat.ExpatError:
+        return False
+    return True
+
+def read_attribute_pairs(path, tag, key, value):
+    """Return (key, value) attribute pairs of each tag element, '' where one is missing.
+    
+    A file that is not well-formed XML raises the parser's error, as
+    iter_elements would.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    # Malformed files go to the parser too, so they fail the same way
+    if (not data.startswith(_UTF16_BOMS)
+            and not any(marker in data for marker in _SLOW_PATH_MARKERS)
+            and _is_well_formed(data)):
+        if b'<!--' in data:
+            data = _COMMENT_RE.sub(b'', data)
+        pairs = [(key_double + key_single, value_double + value_single)
+                 for key_double, key_single, value_double, value_single
+                 in _attribute_pair_re(tag, key, value).findall(data)]
+        # Entity references need unescaping by a parser
+        if b'&' not in data or not any(b'&' in k or b'&' in v for k, v in pairs):
+            try:
+                return [(k.decode(), v.decode()) for k, v in pairs]
+            except UnicodeDecodeError:
+                pass
+    
+    return [(elem.get(key) or '', elem.get(value) or '')
+            for elem in iter_elements(path, tag)]
@@ -17,18 +17,94 @@ Features:
 """
 
 import os
-import re
 import sys
+import functools
 import argparse
-import xml.etree.ElementTree as ET
-from pathlib import Path
-from collections import defaultdict, Counter
-import json
+from collections import defaultdict
+import io
+import operator
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional: with large category tables an Aho-Corasick automaton
+    # classifies a name in one pass instead of testing each category
+    ahocorasick = None
+
+from msbuild_xml import read_attribute_pairs
+
+# Below this many category prefixes, str.startswith over a tuple per
+# category is faster than walking the automaton
+AHOCORASICK_MIN_PREFIXES = 128
+
+def _prerelease_part(label):
+    """Sort key for one dot-separated pre-release label"""
+    # Numeric labels compare as numbers and below text labels, which
+    # NuGet compares case-insensitively
+    if label.isdigit():
+        return (0, int(label), '')
+    return (1, 0, label.lower())
+
+@functools.lru_cache(maxsize=4096)
+def _version_key(version):
+    """Sort key for a NuGet version string, following NuGet's SemVer ordering"""
+    # Build metadata does not take part in ordering
+    core, _, prerelease = version.partition('+')[0].partition('-')
+    parts = [int(part) if part.isdigit() else -1 for part in core.split('.')]
+    # 1.0 and 1.0.0.0 are the same version
+    parts += [0] * (4 - len(parts))
+    # A pre-release sorts below its release
+    return (tuple(parts), not prerelease,
+            tuple(_prerelease_part(label) for label in prerelease.split('.')) if prerelease else ())
+
+def _parse_packages_config(config_file):
+    """Return (package_id, version) pairs from a packages.config file"""
+    packages = []
+    for package_id, version in read_attribute_pairs(config_file, 'package', 'id', 'version'):
+        if package_id and version:
+            packages.append((package_id, version))
+    return packages
+
+def _parse_csproj(csproj_file):
+    """Return (package_id, version) pairs from .csproj PackageReference elements"""
+    packages = []
+    # Handle both old and new project file formats
+    for package_id, version in read_attribute_pairs(csproj_file, 'PackageReference',
+                                                     'Include', 'Version'):
+        if package_id and version:
+            packages.append((package_id, version))
+    return packages
+
+def _parse_package_file(path):
+    """Parse a packages.config or .csproj file in a worker process.
+    
+    Returns (path, packages, error message or None).
+    """
+    try:
+        if os.path.basename(path) == 'packages.config':
+            return path, _parse_packages_config(path), None
+        return path, _parse_csproj(path), None
+    except Exception as e:
+        return path, [], str(e)
+
+def _walk_package_files(directory):
+    """Yield packages.config and .csproj paths under directory in a single walk"""
+    for dirpath, dirnames, filenames in os.walk(directory):
+        for filename in filenames:
+            if filename == 'packages.config' or filename.endswith('.csproj'):
+                yield os.path.join(dirpath, filename)
 
 class PackageVersionExtractor:
     def __init__(self):
-        self.packages = defaultdict(set)  # package_name -> set of versions
-        self.package_sources = defaultdict(list)  # package_name -> list of source files
+        self.packages = defaultdict(dict)  # package_name -> {version: sort key}
+        # package_name -> ids of the distinct source files; each path is stored once in _path_list
+        self.package_sources = defaultdict(lambda: array('I'))
+        self._path_ids = {}  # source file -> id
+        self._path_list = []  # id -> source file
+        self._categories = {}  # package_name -> category, filled during extraction
+        self._sorted_categories = None  # built on first use, see _categorized_packages
         
         # Package categorization for better organization
         self.package_categories = {
@@ -40,68 +116,113 @@ class PackageVersionExtractor:
             'JSON': ['Newtonsoft.Json', 'System.Text.Json'],
             'Utilities': ['ZstdSharp', 'Fare', 'AutoMapper']
         }
+        
+        # Prefix tuples let str.startswith test a whole category at once
+        self._category_table = [(category, tuple(patterns))
+                                for category, patterns in self.package_categories.items()]
+        self._longest_category_prefix = 0
+        self._category_automaton = self._build_category_automaton()
+    
+    def _build_category_automaton(self):
+        """Build an Aho-Corasick automaton over the category prefixes, if available and worthwhile"""
+        prefix_count = sum(len(prefixes) for _, prefixes in self._category_table)
+        if ahocorasick is None or prefix_count < AHOCORASICK_MIN_PREFIXES:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for rank, (category, prefixes) in enumerate(self._category_table):
+            for prefix in prefixes:
+                # A prefix listed under two categories belongs to the first
+                if prefix not in automaton:
+                    automaton.add_word(prefix, (rank, len(prefix), category))
+        automaton.make_automaton()
+        # No prefix match can end past the longest prefix
+        self._longest_category_prefix = max(len(prefix) for _, prefixes in self._category_table
+                                            for prefix in prefixes)
+        return automaton
+    
+    def _path_id(self, path):
+        """Return the id of a source file path, assigning one on first use"""
+        path_id = self._path_ids.get(path)
+        if path_id is None:
+            path_id = self._path_ids[path] = len(self._path_list)
+            self._path_list.append(path)
+        return path_id
+    
+    def _add_packages(self, source_file, packages):
+        """Record (package_id, version) pairs found in source_file"""
+        self._sorted_categories = None
+        source_id = self._path_id(str(source_file))
+        for package_id, version in packages:
+            # The same names and versions repeat across many files; intern them
+            # so every reference shares one string object
+            package_id = sys.intern(package_id)
+            version = sys.intern(version)
+            versions = self.packages.get(package_id)
+            if versions is None:
+                # New package: categorize it once, here, for every later consumer
+                versions = self.packages[package_id] = {}
+                self._categories[package_id] = self.categorize_package(package_id)
+            if version not in versions:
+                # Parse each distinct version once, when it is first seen
+                versions[version] = _version_key(version)
+            sources = self.package_sources[package_id]
+            # Files are added one at a time, so a repeat reference to the
+            # package from this file (e.g. under another Condition) is the last id
+            if not sources or sources[-1] != source_id:
+                sources.append(source_id)
     
     def extract_from_packages_config(self, config_file):
         """Extract package versions from packages.config file"""
         try:
-            tree = ET.parse(config_file)
-            root = tree.getroot()
-            
-            for package in root.findall('package'):
-                package_id = package.get('id')
-                version = package.get('version')
-                
-                if package_id and version:
-                    self.packages[package_id].add(version)
-                    self.package_sources[package_id].append(str(config_file))
-                    
+            self._add_packages(config_file, _parse_packages_config(str(config_file)))
         except Exception as e:
             print(f"Error parsing {config_file}: {e}")
     
     def extract_from_csproj(self, csproj_file):
         """Extract package versions from .csproj PackageReference elements"""
         try:
-            tree = ET.parse(csproj_file)
-            root = tree.getroot()
-            
-            # Handle both old and new project file formats
-            for package_ref in root.findall('.//PackageReference'):
-                package_id = package_ref.get('Include')
-                version = package_ref.get('Version')
-                
-                if package_id and version:
-                    self.packages[package_id].add(version)
-                    self.package_sources[package_id].append(str(csproj_file))
-                    
+            self._add_packages(csproj_file, _parse_csproj(str(csproj_file)))
         except Exception as e:
             print(f"Error parsing {csproj_file}: {e}")
     
     def find_and_extract(self, directory="."):
         """Find and extract from all packages.config and .csproj files"""
-        directory = Path(directory)
-        
-        # Find packages.config files
-        config_files = list(directory.rglob("packages.config"))
-        print(f"Found {len(config_files)} packages.config files")
+        config_count = 0
+        csproj_count = 0
         
-        for config_file in config_files:
-            print(f"  Processing: {config_file}")
-            self.extract_from_packages_config(config_file)
-        
-        # Find .csproj files
-        csproj_files = list(directory.rglob("*.csproj"))
-        print(f"Found {len(csproj_files)} .csproj files")
+        # Walk the tree once and parse files in worker processes as they are
+        # found; merging the results stays in this process
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(_parse_package_file, _walk_package_files(directory), chunksize=16)
+            for path, packages, error in results:
+                print(f"  Processing: {path}")
+                if error:
+                    print(f"Error parsing {path}: {error}")
+                self._add_packages(path, packages)
+                
+                if os.path.basename(path) == 'packages.config':
+                    config_count += 1
+                else:
+                    csproj_count += 1
         
-        for csproj_file in csproj_files:
-            print(f"  Processing: {csproj_file}")
-            self.extract_from_csproj(csproj_file)
+        print(f"Found {config_count} packages.config files")
+        print(f"Found {csproj_count} .csproj files")
     
     def categorize_package(self, package_name):
         """Categorize package based on name patterns"""
-        for category, patterns in self.package_categories.items():
-            for pattern in patterns:
-                if package_name.startswith(pattern):
-                    return category
+        if self._category_automaton is not None:
+            # Keep only matches anchored at the start of the name; the
+            # lowest rank is the first matching category, as in the loop below
+            best = None
+            for end, value in self._category_automaton.iter(package_name, 0, self._longest_category_prefix):
+                if end == value[1] - 1 and (best is None or value < best):
+                    best = value
+            return best[2] if best else 'Other'
+        
+        for category, prefixes in self._category_table:
+            if package_name.startswith(prefixes):
+                return category
         return 'Other'
     
     def resolve_version_conflicts(self):
@@ -113,63 +234,75 @@ class PackageVersionExtractor:
             if len(versions) > 1:
                 conflicts[package_name] = list(versions)
                 # Suggest highest version as resolution
-                version_list = list(versions)
-                version_list.sort(key=lambda v: [int(x) if x.isdigit() else x for x in re.split(r'[.-]', v)])
-                resolutions[package_name] = version_list[-1]
+                resolutions[package_name] = max(versions, key=versions.get)
             else:
-                resolutions[package_name] = list(versions)[0]
+                resolutions[package_name] = next(iter(versions))
         
         return conflicts, resolutions
     
-    def generate_directory_packages_props(self, output_file=None):
-        """Generate Directory.Packages.props content"""
-        conflicts, resolutions = self.resolve_version_conflicts()
+    def _categorized_packages(self):
+        """Return {category: [(package_name, resolved version), ...]}, sorted by name.
         
-        # Group packages by category
-        categorized_packages = defaultdict(list)
-        for package_name, version in resolutions.items():
-            category = self.categorize_package(package_name)
-            categorized_packages[category].append((package_name, version))
+        Categories are in sorted order too. The result is built once and
+        shared by the props generator and the report.
+        """
+        if self._sorted_categories is None:
+            _, resolutions = self.resolve_version_conflicts()
+            
+            categorized_packages = defaultdict(list)
+            for package_name, version in resolutions.items():
+                category = self._categories[package_name]
+                categorized_packages[category].append((package_name, version))
+            
+            by_name = operator.itemgetter(0)
+            self._sorted_categories = {}
+            for category in sorted(categorized_packages):
+                packages = categorized_packages[category]
+                packages.sort(key=by_name)
+                self._sorted_categories[category] = packages
+        return self._sorted_categories
+    
+    def generate_directory_packages_props(self, output_file=None):
+        """Generate Directory.Packages.props content.
         
-        # Sort packages within each category
-        for category in categorized_packages:
-            categorized_packages[category].sort(key=lambda x: x[0])
+        With output_file the content is streamed straight to the file and
+        None is returned in its place; otherwise it is returned as a string.
+        """
+        conflicts, _ = self.resolve_version_conflicts()
+        categorized_packages = self._categorized_packages()
         
-        # Generate XML content
-        lines = []
-        lines.append('<Project>')
-        lines.append('  <PropertyGroup>')
-        lines.append('    <ManagePackageVersionsCentrally>true</ManagePackageVersionsCentrally>')
-        lines.append('  </PropertyGroup>')
-        lines.append('')
+        if output_file:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                self._write_directory_packages_props(f, categorized_packages)
+            print(f"Directory.Packages.props written to {output_file}")
+            return None, conflicts
         
-        # Add packages by category
-        for category in sorted(categorized_packages.keys()):
-            if category != 'Other':  # Process 'Other' last
-                lines.append(f'  <ItemGroup Label="{category}">')
-                for package_name, version in categorized_packages[category]:
-                    lines.append(f'    <PackageVersion Include="{package_name}" Version="{version}" />')
-                lines.append('  </ItemGroup>')
-                lines.append('')
+        buf = io.StringIO()
+        self._write_directory_packages_props(buf, categorized_packages)
+        return buf.getvalue(), conflicts
+    
+    def _write_directory_packages_props(self, out, categorized_packages):
+        """Write Directory.Packages.props XML to a text stream"""
+        write = out.write
+        write('<Project>\n')
+        write('  <PropertyGroup>\n')
+        write('    <ManagePackageVersionsCentrally>true</ManagePackageVersionsCentrally>\n')
+        write('  </PropertyGroup>\n')
+        write('\n')
         
-        # Add 'Other' category if it exists
+        # Add packages by category, with 'Other' last
+        categories = [category for category in categorized_packages if category != 'Other']
         if 'Other' in categorized_packages:
-            lines.append('  <ItemGroup Label="Other">')
-            for package_name, version in categorized_packages['Other']:
-                lines.append(f'    <PackageVersion Include="{package_name}" Version="{version}" />')
-            lines.append('  </ItemGroup>')
-            lines.append('')
-        
-        lines.append('</Project>')
-        
-        content = '\n'.join(lines)
+            categories.append('Other')
         
-        if output_file:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"Directory.Packages.props written to {output_file}")
+        for category in categories:
+            write(f'  <ItemGroup Label="{category}">\n')
+            for package_name, version in categorized_packages[category]:
+                write(f'    <PackageVersion Include="{package_name}" Version="{version}" />\n')
+            write('  </ItemGroup>\n')
+            write('\n')
         
-        return content, conflicts
+        write('</Project>\n')
     
     def generate_report(self):
         """Generate extraction and conflict report"""
@@ -189,31 +322,28 @@ class PackageVersionExtractor:
             for package_name, versions in conflicts.items():
                 report.append(f"{package_name}:")
                 for version in sorted(versions):
-                    sources = [src for src in self.package_sources[package_name]]
+                    sources = self.package_sources[package_name]
                     report.append(f"  {version} (used in {len(sources)} files)")
                 report.append(f"  RECOMMENDED: {resolutions[package_name]}")
                 report.append("")
         
         # Package count by category
-        categorized_packages = defaultdict(list)
-        for package_name in self.packages.keys():
-            category = self.categorize_package(package_name)
-            categorized_packages[category].append(package_name)
-        
         report.append("PACKAGES BY CATEGORY:")
         report.append("-" * 20)
-        for category in sorted(categorized_packages.keys()):
-            count = len(categorized_packages[category])
-            report.append(f"{category}: {count} packages")
+        for category, packages in self._categorized_packages().items():
+            report.append(f"{category}: {len(packages)} packages")
         
         return "\n".join(report)
     
     def export_detailed_data(self, output_file):
         """Export detailed extraction data to JSON"""
+        import json
+        
         data = {
             'packages': {name: list(versions) for name, versions in self.packages.items()},
-            'sources': dict(self.package_sources),
-            'categories': {name: self.categorize_package(name) for name in self.packages.keys()}
+            'sources': {name: sorted(self._path_list[source_id] for source_id in source_ids)
+                        for name, source_ids in self.package_sources.items()},
+            'categories': dict(self._categories)
         }
         
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -249,7 +379,7 @@ def main():
     else:
         content, conflicts = extractor.generate_directory_packages_props()
         print("DRY RUN - Directory.Packages.props content:")
-        print(content)
+        print(content, end="")
     
     # Generate report
     report = extractor.generate_report()